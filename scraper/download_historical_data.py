@@ -1,9 +1,20 @@
+import io
 import os
+import asyncio
 import zipfile
-import requests
+import aiohttp
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 
+MAX_CONCURRENT_DOWNLOADS = 8
+MAX_EXTRACT_WORKERS = 4
+MAX_RETRIES = 3
+BACKOFF_BASE_SECONDS = 1
+CHUNK_SIZE = 1 << 20
+# Timeouts apply per socket operation so a slow but progressing download is not cut off
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(sock_connect=30, sock_read=30)
+
 # Generates all month codes between two dates (inclusive)
 def generate_month_codes(start_date, end_date):
     months = []
@@ -17,52 +28,75 @@ def generate_month_codes(start_date, end_date):
     
     return months
 
-# Downloads FIDE data to the output directory for a given month code
-def download_fide_data(month_code, output_dir="historical_data"):
+# Downloads the FIDE zip for a given month code into memory, retrying with exponential backoff
+async def download_fide_data(session, semaphore, month_code):
     url = f"http://ratings.fide.com/download/standard_{month_code}frl.zip"
     
-    os.makedirs(output_dir, exist_ok=True)
-    
-    filename = os.path.join(output_dir, f"standard_{month_code}frl.zip")
-    
-    try:
-        print(f"Downloading {month_code}...", end=" ")
-        response = requests.get(url, timeout=30)
+    for attempt in range(MAX_RETRIES):
+        # The download slot is only held for the request itself, not while backing off
+        async with semaphore:
+            try:
+                print(f"Downloading {month_code}...")
+                async with session.get(url, timeout=REQUEST_TIMEOUT) as response:
+                    if response.status == 200:
+                        # The zip is kept in memory (a few MB) and never written to disk, only its extracted text file is
+                        buffer = io.BytesIO()
+                        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                            buffer.write(chunk)
+                        print(f"  {month_code}: Downloaded {buffer.tell()} bytes")
+                        buffer.seek(0)
+                        return buffer
+                    elif response.status < 500:
+                        # Client errors (e.g. 404 for an unpublished month) won't succeed on retry
+                        print(f"  {month_code}: Failed (Status: {response.status})")
+                        return None
+                    else:
+                        print(f"  {month_code}: Server error (Status: {response.status})")
+                    
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"  {month_code}: Error: {e}")
         
-        if response.status_code == 200:
-            with open(filename, 'wb') as f:
-                f.write(response.content)
-            print(f"Saved to {filename}")
-            return True
-        else:
-            print(f"Failed (Status: {response.status_code})")
-            return False
-            
-    except Exception as e:
-        print(f"Error: {e}")
-        return False
+        if attempt < MAX_RETRIES - 1:
+            delay = BACKOFF_BASE_SECONDS * 2 ** attempt
+            print(f"  {month_code}: Retrying in {delay}s...")
+            await asyncio.sleep(delay)
     
-# Extracts zip file and deletes it after extraction
-def extract_and_cleanup(zip_path, output_dir="historical_data"):
+    print(f"  {month_code}: Giving up after {MAX_RETRIES} attempts")
+    return None
+
+# Extracts an in-memory zip file to the output directory
+def extract_zip(zip_buffer, month_code, output_dir="historical_data"):
     try:
-        print(f"  Extracting {os.path.basename(zip_path)}...", end=" ")
+        os.makedirs(output_dir, exist_ok=True)
         
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        with zipfile.ZipFile(zip_buffer, 'r') as zip_ref:
             zip_ref.extractall(output_dir)
         
-        print(f"Extracted")
-        
-        # Delete the zip file after extraction
-        os.remove(zip_path)
-        print(f"Deleted {os.path.basename(zip_path)}")
+        print(f"  {month_code}: Extracted to {output_dir}")
         
         return True
     except Exception as e:
-        print(f"Error extracting: {e}")
+        print(f"  {month_code}: Error extracting: {e}")
         return False
 
+# Downloads and extracts a single month. Extraction is handed to the thread pool as soon as the download finishes,
+# so it overlaps with the downloads still in flight (zlib releases the GIL while decompressing).
+async def fetch(session, semaphore, extract_pool, month_code, output_dir="historical_data"):
+    # Skip months that were already downloaded and extracted by a previous run
+    if os.path.exists(os.path.join(output_dir, f"standard_{month_code}frl.txt")):
+        print(f"  {month_code}: Already extracted, skipping")
+        return True
+    
+    zip_buffer = await download_fide_data(session, semaphore, month_code)
+    
+    if not zip_buffer:
+        return False
+    
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(extract_pool, extract_zip, zip_buffer, month_code, output_dir)
+
 # Main entry point, downloads historical data from Oct 2024-Oct 2025
-def main():
+async def main():
     end_date = datetime(2025, 10, 1)
     start_date = datetime(2024, 10, 1)
     
@@ -71,22 +105,19 @@ def main():
     
     month_codes = generate_month_codes(start_date, end_date)
     
-    successful = 0
-    failed = 0
+    # All months are fetched concurrently, bounded by the semaphore and the connection pool
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_DOWNLOADS)
     
-    for month_code in month_codes:
-        zip_path = download_fide_data(month_code)
-        
-        if zip_path:
-            if extract_and_cleanup(zip_path):
-                successful += 1
-            else:
-                failed += 1
-        else:
-            failed += 1
+    with ThreadPoolExecutor(max_workers=MAX_EXTRACT_WORKERS) as extract_pool:
+        async with aiohttp.ClientSession(connector=connector) as session:
+            results = await asyncio.gather(*[fetch(session, semaphore, extract_pool, m) for m in month_codes])
+    
+    successful = sum(1 for r in results if r)
+    failed = len(results) - successful
     
     print("=" * 60)
     print(f"Download complete: {successful} successful, {failed} failed")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -1,61 +1,58 @@
-import json
+import orjson
 import os
+import requests
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
+from selectolax.lexbor import LexborHTMLParser
 
-# Configure Chrome WebDriver (headless)
-def setup_driver():
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-    
-    driver = webdriver.Chrome(options=chrome_options)
-    return driver
+# Top 100 open list. The rankings are in the page's <table class="top_recors_table">, one <tbody> <tr> per player with
+# cells rank, name (<a href=".../profile/<fide_id>">), federation, rating, birth year. These are the same selectors the
+# Selenium scraper waited on, and the table is fetched with a plain request (no browser needed).
+TOP_LIST_URL = "https://ratings.fide.com/top_lists.phtml?list=open"
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
 
 # Scrape top 100 chess players from FIDE
 def scrape_fide_rankings():
-    driver = setup_driver()
     players = []
     
     try:
-        url = "https://ratings.fide.com/top_lists.phtml?list=open"
-        driver.get(url)
+        response = requests.get(TOP_LIST_URL, headers=HEADERS, timeout=30)
+        response.raise_for_status()
         
-        wait = WebDriverWait(driver, 10)
-        table = wait.until(EC.presence_of_element_located((By.CLASS_NAME, "top_recors_table")))
+        tree = LexborHTMLParser(response.text)
+        table = tree.css_first("table.top_recors_table")
+        if table is None:
+            raise ValueError(f"Rankings table not found in {TOP_LIST_URL}, the page markup may have changed")
         
         # Get all rows except header
-        rows = table.find_elements(By.CSS_SELECTOR, "tbody tr")
+        rows = table.css("tbody tr")
+        if not rows:
+            raise ValueError(f"Rankings table in {TOP_LIST_URL} has no rows, it may be filled in by JavaScript now")
         
         for row in rows[:100]:
-            cells = row.find_elements(By.TAG_NAME, "td")
+            cells = row.css("td")
             
             if len(cells) >= 5:
                 # Extract rank (not currently used for historical tracking but maybe in future)
-                rank = cells[0].text.strip()
+                rank = cells[0].text(strip=True)
                 
                 # Extract name and profile link (for FIDE ID)
-                name_link = cells[1].find_element(By.TAG_NAME, "a")
-                name = name_link.text.strip()
-                profile_url = name_link.get_attribute("href")
+                name_link = cells[1].css_first("a")
+                name = name_link.text(strip=True)
+                profile_url = name_link.attributes.get("href")
                 fide_id = profile_url.split("/")[-1] if profile_url else None
                 
                 # Extract federation
                 fed_cell = cells[2]
-                fed_code = fed_cell.text.strip()
+                fed_code = fed_cell.text(strip=True)
                 
                 # Extract rating
-                rating = cells[3].text.strip()
+                rating = cells[3].text(strip=True)
                 
                 # Extract birth year
-                birth_year = cells[4].text.strip()
+                birth_year = cells[4].text(strip=True)
                 
                 player = {
                     "rank": int(rank),
@@ -74,8 +71,6 @@ def scrape_fide_rankings():
     except Exception as e:
         print(f"Error scraping FIDE rankings: {e}")
         raise
-    finally:
-        driver.quit()
     
     return players
 
@@ -85,14 +80,17 @@ def save_rankings(players):
     
     os.makedirs("data", exist_ok=True)
     
+    # Serialized once and written to both files
+    rankings_json = orjson.dumps(players, option=orjson.OPT_INDENT_2)
+    
     # Save monthly snapshot
     filename = f"data/rankings_{timestamp}.json"
-    with open(filename, 'w') as f:
-        json.dump(players, f, indent=2)
+    with open(filename, 'wb') as f:
+        f.write(rankings_json)
     
     # Update rankings
-    with open("data/rankings_latest.json", 'w') as f:
-        json.dump(players, f, indent=2)
+    with open("data/rankings_latest.json", 'wb') as f:
+        f.write(rankings_json)
     
     print(f"Rankings saved to {filename}")
     
@@ -1,188 +1,454 @@
 import os
+import asyncio
+import struct
+import itertools
+import numpy as np
+import httpx
+import psycopg2
 from datetime import datetime
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
 load_dotenv()
 
+# Rows per upsert request. Once a batch is rejected for its size, the rest of the run uses fallback-sized batches.
+BATCH_SIZE = 5000
+FALLBACK_BATCH_SIZE = 2000
+MAX_CONCURRENT_UPSERTS = 8
+
+# Rows per read request. Must not exceed PostgREST's max_rows setting (1000 by default on Supabase),
+# otherwise a capped page looks like the last one.
+PAGE_SIZE = 1000
+
 def get_db_connection():
     url = os.getenv("SUPABASE_URL")
     key = os.getenv("SUPABASE_SECRET_KEY")
     return create_client(url, key)
 
-# Gets FIDE IDs that already exist in the database. This is used to include players below the rating threshold.
-def get_existing_fide_ids(conn):
-    response = conn.table("players").select("fide_id").execute()
-    return {row["fide_id"] for row in response.data}
+# Direct Postgres connection (SUPABASE_DB_URL, a direct or session pooler connection string). When set, seeding
+# bulk loads with COPY instead of going through PostgREST.
+def get_pg_connection():
+    return psycopg2.connect(os.getenv("SUPABASE_DB_URL"))
 
-# Extracts relevant player data from FIDE historical text file (name, fide_id, federation, rating, birth_year)
-def parse_fide_text_file(filepath, min_rating=2500, existing_fide_ids=None):
-    players = []
-    existing_fide_ids = existing_fide_ids or set()
+# Reads every row of a query in pages, since PostgREST silently caps a single response at max_rows.
+# build_query should return a fresh, ordered query for each page.
+def fetch_all_rows(build_query):
+    rows = []
+    offset = 0
     
-    with open(filepath, 'r', encoding='latin-1') as f:
-        lines = f.readlines()
+    while True:
+        response = build_query().range(offset, offset + PAGE_SIZE - 1).execute()
+        rows.extend(response.data)
+        
+        if len(response.data) < PAGE_SIZE:
+            break
+        offset += PAGE_SIZE
     
-    # Skip header line
-    data_lines = [line for line in lines[1:] if line.strip()]
-    print(f"Data lines (after header): {len(data_lines)}")
+    return rows
+
+# Gets players that already exist in the database, mapped as fide_id -> (name, birth_year). The FIDE IDs are used to
+# include players below the rating threshold, and the static fields to skip upserting players that haven't changed.
+def get_existing_players(conn):
+    rows = fetch_all_rows(lambda: conn.table("players").select("fide_id,name,birth_year").order("fide_id"))
+    return {row["fide_id"]: (row["name"], row["birth_year"]) for row in rows}
+
+# Gets FIDE IDs that already have a ranking for the given date, so re-running a month doesn't resend them
+def get_seeded_fide_ids(conn, scraped_date):
+    rows = fetch_all_rows(
+        lambda: conn.table("rankings").select("fide_id").eq("scraped_date", scraped_date).order("fide_id")
+    )
+    return {row["fide_id"] for row in rows}
 
-    # Debug: print first few lines to see the format
-    if len(data_lines) > 0:
-        print("\nFirst 3 lines for debugging:")
-        for i, line in enumerate(data_lines[:3]):
-            print(f"Line {i+2} (length {len(line)}): {repr(line[:150])}")
+# Async PostgREST client for bulk upserts, authenticated the same way as the supabase client
+def get_rest_client():
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_SECRET_KEY")
+    return httpx.AsyncClient(
+        base_url=f"{url}/rest/v1",
+        headers={'apikey': key, 'Authorization': f"Bearer {key}"},
+        http2=True,
+        timeout=60
+    )
+
+# Yields consecutive slices of rows
+def batched(rows, batch_size=BATCH_SIZE):
+    for i in range(0, len(rows), batch_size):
+        yield rows[i:i + batch_size]
+
+# Whether a failed upsert was rejected for its size: payload too large (413), or the insert hitting Postgres'
+# statement timeout (57014), which PostgREST reports as a 500 with the SQLSTATE as its error code
+def is_batch_too_large(response):
+    if response.status_code == 413:
+        return True
+    try:
+        return response.json().get('code') == '57014'
+    except ValueError:
+        return False
+
+# Upserts a batch of rows. Batches rejected for their size are retried in fallback-sized chunks, and limits['batch_size']
+# is lowered so every later batch of the run is split up front instead of failing first.
+async def upsert_batch(client, semaphore, limits, table, rows, on_conflict, ignore_duplicates=False):
+    if len(rows) > limits['batch_size']:
+        await asyncio.gather(*[
+            upsert_batch(client, semaphore, limits, table, batch, on_conflict, ignore_duplicates)
+            for batch in batched(rows, limits['batch_size'])
+        ])
+        return
     
-    skipped_invalid = 0
-    skipped_low_rating = 0
+    resolution = 'ignore-duplicates' if ignore_duplicates else 'merge-duplicates'
+    
+    async with semaphore:
+        response = await client.post(
+            f"/{table}",
+            params={'on_conflict': on_conflict},
+            headers={'Prefer': f"return=minimal,resolution={resolution}"},  # Don't send the upserted rows back
+            json=rows
+        )
+    
+    if response.is_success:
+        return
+    
+    if len(rows) <= FALLBACK_BATCH_SIZE or not is_batch_too_large(response):
+        response.raise_for_status()
+    
+    print(f"  Batch of {len(rows)} rows too large (Status: {response.status_code}), using batches of {FALLBACK_BATCH_SIZE} from now on...")
+    limits['batch_size'] = FALLBACK_BATCH_SIZE
+    await upsert_batch(client, semaphore, limits, table, rows, on_conflict, ignore_duplicates)
 
-    # Text files use a fixed-width format:
-        # Positions:
-        # 0-14: FIDE ID
-        # 15-75: Name
-        # 76-78: Federation
-        # 79: Sex
-        # 80-112: Other fields (titles, etc.)
-        # 113-117: Rating (4 digits)
-        # 126-130: Birth year (4 digits)
-    for line_num, line in enumerate(data_lines, start=2):
-        try:
-            # Make sure line is long enough
-            if len(line) < 123:
-                skipped_invalid += 1
-                continue
-            
-            fide_id = line[0:15].strip()
-            name = line[15:76].strip()
-            federation = line[76:79].strip()  # Plan to be used for nation comparisons
-            sex = line[79:80].strip()  # Not currently used
-            title = line[80:83].strip()  # Not currently used
-            
-            rating_str = line[113:117].strip()
+# Upserts players and rankings concurrently. batches is a list of (player rows, ranking rows) pairs covering the same
+# FIDE IDs, so each rankings batch is sent as soon as its players batch is stored. This overlaps the two tables
+# without a ranking ever referencing a player that hasn't been inserted yet.
+async def upsert_players_and_rankings(batches):
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPSERTS)
+    limits = {'batch_size': BATCH_SIZE}  # Shared by every upsert of the run
+    processed = 0
+    
+    async with get_rest_client() as client:
+        async def push(player_batch, ranking_batch):
+            nonlocal processed
+            if player_batch:
+                await upsert_batch(client, semaphore, limits, "players", player_batch, on_conflict='fide_id')
+            if ranking_batch:
+                await upsert_batch(
+                    client,
+                    semaphore,
+                    limits,
+                    "rankings",
+                    ranking_batch,
+                    on_conflict='fide_id,scraped_date',
+                    ignore_duplicates=True  # Rankings are only inserted if data doesn't exist for this date
+                )
+            processed += len(ranking_batch)
+            print(f"  Processed {processed}/{total} players and rankings...")
+        
+        total = sum(len(ranking_batch) for _, ranking_batch in batches)
+        await asyncio.gather(*[push(player_batch, ranking_batch) for player_batch, ranking_batch in batches])
 
-            birthday_str = line[126:130].strip()
+# Formats a value for COPY's text format
+def copy_value(value):
+    if value is None:
+        return '\\N'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
 
-            # Debug first player
-            if line_num == 2:
-                print(f"\nParsing first player:")
-                print(f"  FIDE ID: '{fide_id}'")
-                print(f"  Name: '{name}'")
-                print(f"  Federation: '{federation}'")
-                print(f"  Sex: '{sex}'")
-                print(f"  Rating str: '{rating_str}'")
-                print(f"  Birth year str: '{birthday_str}'")
-                print(f"  Positions 110-120: '{line[110:120]}'")
-                print(f"  Positions 120-130: '{line[120:130]}'")
-            
-            # Skip if invalid data
-            if not fide_id or not rating_str or not name:
-                skipped_invalid += 1
-                continue
-            
-            # Convert rating to int
-            try:
-                rating = int(rating_str)
-            except ValueError:
-                skipped_invalid += 1
-                continue
+# Read-only file object over an iterator of text, so COPY pulls rows as it sends them instead of from a prebuilt buffer
+class IteratorFile:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.buffer = ''
+    
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) < size:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                break
+            self.buffer += chunk
+        
+        if size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+# Streams rows into a table with COPY, formatting each row only when COPY reads it
+def copy_rows(cursor, table, columns, rows):
+    lines = ('\t'.join(copy_value(row[column]) for column in columns) + '\n' for row in rows)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", IteratorFile(lines))
+
+# Bulk loads players and rankings with COPY into temporary staging tables, then merges them into the real tables with
+# the same conflict handling as the REST upserts. Everything runs in one transaction, players before rankings.
+# player_data and ranking_data can be any iterables of rows, each is read once while it is copied.
+def copy_players_and_rankings(player_data, ranking_data):
+    player_columns = ['fide_id', 'name', 'birth_year']
+    ranking_columns = ['fide_id', 'rank', 'rating', 'federation', 'scraped_date', 'scraped_at', 'data_source']
+    
+    conn = get_pg_connection()
+    try:
+        with conn, conn.cursor() as cursor:
+            cursor.execute(f"""
+                CREATE TEMP TABLE players_stage ON COMMIT DROP AS
+                SELECT {', '.join(player_columns)} FROM players WITH NO DATA
+            """)
+            cursor.execute(f"""
+                CREATE TEMP TABLE rankings_stage ON COMMIT DROP AS
+                SELECT {', '.join(ranking_columns)} FROM rankings WITH NO DATA
+            """)
             
-            # Include if rating >= min_rating OR already exists in DB
-            if rating < min_rating and fide_id not in existing_fide_ids:
-                skipped_low_rating += 1
-                continue
+            copy_rows(cursor, "players_stage", player_columns, player_data)
+            cursor.execute(f"""
+                INSERT INTO players ({', '.join(player_columns)})
+                SELECT {', '.join(player_columns)} FROM players_stage
+                ON CONFLICT (fide_id) DO UPDATE SET name = EXCLUDED.name, birth_year = EXCLUDED.birth_year
+            """)
+            print(f"  Copied {cursor.rowcount} players")  # Rows inserted or updated by the merge
             
-            # Parse birth year from birthday string (YYYY/MM/DD)
+            copy_rows(cursor, "rankings_stage", ranking_columns, ranking_data)
+            cursor.execute(f"""
+                INSERT INTO rankings ({', '.join(ranking_columns)})
+                SELECT {', '.join(ranking_columns)} FROM rankings_stage
+                ON CONFLICT (fide_id, scraped_date) DO NOTHING
+            """)
+            print(f"  Copied {cursor.rowcount} rankings")
+    finally:
+        conn.close()
+
+# Text files use a fixed-width format:
+    # Positions:
+    # 0-14: FIDE ID
+    # 15-75: Name
+    # 76-78: Federation
+    # 79: Sex
+    # 80-112: Other fields (titles, etc.)
+    # 113-117: Rating (4 digits)
+    # 126-130: Birth year (4 digits)
+MIN_LINE_LENGTH = 123
+
+# Record layout for the fixed-width format above: fide_id, name, federation, sex, (other fields), rating, (other fields), birth year
+FIDE_RECORD = struct.Struct('15s61s3s1s33s4s9s4s')
+
+# Bytes of the file scanned at a time by the vectorized pre-filter
+PARSE_BLOCK_BYTES = 1 << 23
+
+NEWLINE, CARRIAGE_RETURN, SPACE, ZERO, NINE = b'\n'[0], b'\r'[0], b' '[0], b'0'[0], b'9'[0]
+RATING_OFFSETS = np.arange(113, 117)
+RATING_PLACE_VALUES = np.array([1000, 100, 10, 1])
+FIDE_ID_PREFIX_OFFSETS = np.arange(8)
+
+# Parses a single data line (bytes, without its line ending). Returns the player, or None with the reason it was skipped.
+def parse_fide_line(line, min_rating, existing_fide_id_bytes):
+    if len(line) < FIDE_RECORD.size:
+        line = line.ljust(FIDE_RECORD.size)
+    
+    fide_id, name, federation, sex, _, rating_str, _, birthday_str = FIDE_RECORD.unpack_from(line)
+    fide_id = fide_id.strip()
+    name = name.strip()
+    
+    # Skip if invalid data (int() ignores surrounding whitespace and rejects blank fields)
+    if not fide_id or not name:
+        return None, 'invalid'
+    
+    try:
+        rating = int(rating_str)
+    except ValueError:
+        return None, 'invalid'
+    
+    # Include if rating >= min_rating OR already exists in DB
+    if rating < min_rating and fide_id not in existing_fide_id_bytes:
+        return None, 'low_rating'
+    
+    # Parse birth year, discarding placeholders like 0000 with a sanity check
+    try:
+        birth_year = int(birthday_str)
+        if birth_year < 1900 or birth_year > 2024:
             birth_year = None
-            if birthday_str and len(birthday_str) >= 4:
-                try:
-                    birth_year = int(birthday_str[0:4])
-                    if birth_year < 1900 or birth_year > 2024: # sanity check
-                        birth_year = None
-                except ValueError:
-                    pass
+    except ValueError:
+        birth_year = None
+    
+    player = {
+        'fide_id': fide_id.decode('latin-1'),
+        'name': name.decode('latin-1'),
+        'federation': federation.strip().decode('latin-1'),  # Plan to be used for nation comparisons
+        'rating': rating,
+        'birth_year': birth_year,
+        'sex': sex.strip().decode('latin-1'),  # Not currently used
+        'title': None,  # Not currently used
+        'rank': None  # historical data doesn't have rank
+    }
+    
+    return player, None
+
+# Yields blocks of roughly PARSE_BLOCK_BYTES that always end on a line boundary
+def read_line_blocks(f):
+    remainder = b''
+    
+    while True:
+        block = f.read(PARSE_BLOCK_BYTES)
+        if not block:
+            if remainder:
+                yield remainder
+            return
+        
+        block = remainder + block
+        cut = block.rfind(b'\n') + 1
+        remainder = block[cut:]
+        if cut:
+            yield block[:cut]
+
+# Splits a block into lines and flags the ones that can be skipped as low rated without parsing them in Python:
+# a plain 4 digit rating below min_rating, a FIDE ID and name present, and a FIDE ID prefix that doesn't match any
+# existing player. Returns each line's start, end (excluding the line ending), length and skip flag.
+def scan_line_block(block, min_rating, existing_fide_id_prefixes):
+    buffer = np.frombuffer(block, dtype=np.uint8)
+    
+    ends = np.flatnonzero(buffer == NEWLINE)
+    has_newline = np.ones(len(ends), dtype=bool)
+    if buffer[-1] != NEWLINE:  # Last line of a file without a trailing newline
+        ends = np.append(ends, len(buffer))
+        has_newline = np.append(has_newline, False)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    
+    # Lengths count the line ending as one character (\r\n included), the same as reading the file in text mode
+    has_carriage_return = (ends > starts) & (buffer[np.maximum(ends - 1, 0)] == CARRIAGE_RETURN)
+    content_ends = ends - has_carriage_return
+    lengths = content_ends - starts + has_newline
+    
+    low_rated = np.zeros(len(starts), dtype=bool)
+    long_enough = lengths >= MIN_LINE_LENGTH
+    line_starts = starts[long_enough]
+    
+    rating_digits = buffer[line_starts[:, None] + RATING_OFFSETS]
+    is_plain_rating = ((rating_digits >= ZERO) & (rating_digits <= NINE)).all(axis=1)
+    rating = (rating_digits.astype(np.int64) - ZERO) @ RATING_PLACE_VALUES
+    
+    fide_id_prefix = buffer[line_starts[:, None] + FIDE_ID_PREFIX_OFFSETS].view(np.uint64).ravel()
+    
+    low_rated[long_enough] = (
+        is_plain_rating
+        & (buffer[line_starts] != SPACE)  # FIDE ID present
+        & (buffer[line_starts + 15] != SPACE)  # Name present
+        & (rating < min_rating)
+        & ~np.isin(fide_id_prefix, existing_fide_id_prefixes)
+    )
+    
+    return starts, content_ends, lengths, low_rated
+
+# Extracts relevant player data from FIDE historical text file (name, fide_id, federation, rating, birth_year).
+# Each block of the file is pre-filtered with NumPy, which settles the large majority of lines (players below the rating
+# threshold) without touching them in Python. The remaining lines are unpacked with a precompiled struct, and only the
+# fields of kept players are ever decoded to str.
+def parse_fide_text_file(filepath, min_rating=2500, existing_players=None):
+    players = []
+    existing_players = existing_players or {}
+    existing_fide_id_bytes = {fide_id.encode('latin-1') for fide_id in existing_players}
+    
+    # First 8 bytes of each existing ID as padded in the file. Prefix matches are only candidates, checked exactly later.
+    existing_fide_id_prefixes = np.frombuffer(
+        b''.join(fide_id.ljust(15)[:8] for fide_id in existing_fide_id_bytes),
+        dtype=np.uint64
+    )
+    
+    data_lines = 0
+    skipped_invalid = 0
+    skipped_low_rating = 0
+    
+    with open(filepath, 'rb') as f:
+        # Skip header line
+        if next(f, None) is None:
+            print(f"\n{filepath} is empty, no players to parse")
+            return players
+        
+        for block_index, block in enumerate(read_line_blocks(f)):
+            starts, ends, lengths, low_rated = scan_line_block(block, min_rating, existing_fide_id_prefixes)
             
-            player = {
-                'fide_id': fide_id,
-                'name': name,
-                'federation': federation,
-                'rating': rating,
-                'birth_year': birth_year,
-                'sex': sex,
-                'title': None, # Not currently used
-                'rank': None  # historical data doesn't have rank
-            }
+            # Debug: print first few lines to see the format (line numbers count the header as line 1)
+            if block_index == 0:
+                print("\nFirst 3 lines for debugging:")
+                line_bounds = enumerate(zip(starts, ends, lengths), start=2)
+                non_blank = ((n, start, end, length) for n, (start, end, length) in line_bounds if block[start:end].strip())
+                for line_num, start, end, length in itertools.islice(non_blank, 3):
+                    print(f"Line {line_num} (length {length}): {repr(block[start:end][:150].decode('latin-1'))}")
             
-            players.append(player)
+            skipped = int(low_rated.sum())
+            data_lines += skipped
+            skipped_low_rating += skipped
             
-        except (ValueError, IndexError) as e:
-            print(f"Warning: Skipping line {line_num} due to parse error: {str(e)}")
-            skipped_invalid += 1
-            continue
+            remaining = ~low_rated
+            for start, end, length in zip(starts[remaining].tolist(), ends[remaining].tolist(), lengths[remaining].tolist()):
+                line = block[start:end]
+                
+                # Make sure line is long enough (blank lines aren't counted as data)
+                if length < MIN_LINE_LENGTH:
+                    if line.strip():
+                        data_lines += 1
+                        skipped_invalid += 1
+                    continue
+                
+                if not line.strip():
+                    continue
+                data_lines += 1
+                
+                player, skip_reason = parse_fide_line(line, min_rating, existing_fide_id_bytes)
+                if player:
+                    players.append(player)
+                elif skip_reason == 'invalid':
+                    skipped_invalid += 1
+                else:
+                    skipped_low_rating += 1
     
     print(f"\nParsing summary:")
+    print(f"  Data lines (after header): {data_lines}")
     print(f"  Valid players found: {len(players)}")
     print(f"  Skipped (invalid data): {skipped_invalid}")
     print(f"  Skipped (rating < {min_rating}): {skipped_low_rating}")
     
     return players
 
-# Seeds the database with rating data. Ignores players below 2500 rating unless they already exist in the DB
-def seed_database(filepath, data_date, min_rating=2500):
+# Seeds the database with rating data. Ignores players below 2500 rating unless they already exist in the DB.
+# existing_players is queried from the database if not provided, and is updated in place with upserted players.
+def seed_database(filepath, data_date, min_rating=2500, existing_players=None):
     print(f"\nParsing file: {filepath}")
     print(f"Data date: {data_date}")
     print(f"Minimum rating for new players: {min_rating}")
     
     conn = get_db_connection()
     
-    existing_fide_ids = get_existing_fide_ids(conn)
-    print(f"Found {len(existing_fide_ids)} existing players in database")
+    if existing_players is None:
+        existing_players = get_existing_players(conn)
+    print(f"Found {len(existing_players)} existing players in database")
     
-    players = parse_fide_text_file(filepath, min_rating, existing_fide_ids)
+    players = parse_fide_text_file(filepath, min_rating, existing_players)
     print(f"Parsed {len(players)} players (>={min_rating} or already in DB)")
     
     if not players:
         print("No players found! Check your parsing logic or min_rating threshold.")
         return
     
-    new_players = [p for p in players if p['fide_id'] not in existing_fide_ids]
-    existing_players = [p for p in players if p['fide_id'] in existing_fide_ids]
+    new_players, returning_players = [], []
+    for p in players:
+        (returning_players if p['fide_id'] in existing_players else new_players).append(p)
     print(f"  - New players (>={min_rating}): {len(new_players)}")
-    print(f"  - Existing players (any rating): {len(existing_players)}")
+    print(f"  - Existing players (any rating): {len(returning_players)}")
     
     try:
-        scraped_date = datetime.strptime(data_date, '%Y-%m-%d').date().isoformat()
-        scraped_at = datetime.strptime(data_date, '%Y-%m-%d').isoformat()
+        data_datetime = datetime.strptime(data_date, '%Y-%m-%d')
+        scraped_date = data_datetime.date().isoformat()
+        scraped_at = data_datetime.isoformat()
         
-        print("\nInserting/updating players...")
-        batch_size = 100
-        player_count = 0
+        seeded_fide_ids = get_seeded_fide_ids(conn, scraped_date)
         
-        for i in range(0, len(players), batch_size):
-            batch = players[i:i + batch_size]
-            player_data = [
+        # Rows are built once per batch of parsed players, and only for what needs to be sent: players that are new or
+        # whose name/birth year changed since the last upsert, and rankings that haven't already been seeded for this date
+        batches = []
+        for batch in batched(players):
+            player_batch = [
                 {
                     'fide_id': p['fide_id'],
                     'name': p['name'],
                     'birth_year': p['birth_year']
                 }
                 for p in batch
+                if existing_players.get(p['fide_id']) != (p['name'], p['birth_year'])
             ]
             
-            conn.table("players").upsert(
-                player_data,
-                on_conflict='fide_id'
-            ).execute()
-            
-            player_count += len(batch)
-            print(f"  Processed {player_count}/{len(players)} players...")
-        
-        # Insert rankings in batches if data doesn't exist for this date
-        print("\nInserting rankings...")
-        ranking_count = 0
-        
-        for i in range(0, len(players), batch_size):
-            batch = players[i:i + batch_size]
-            ranking_data = [
+            ranking_batch = [
                 {
                     'fide_id': p['fide_id'],
                     'rank': p['rank'],  # NULL for historical data
@@ -193,16 +459,31 @@ def seed_database(filepath, data_date, min_rating=2500):
                     'data_source': 'historical'  # Mark as historical data to differentiate from scraped data
                 }
                 for p in batch
+                if p['fide_id'] not in seeded_fide_ids
             ]
             
-            conn.table("rankings").upsert(
-                ranking_data,
-                on_conflict='fide_id,scraped_date',
-                ignore_duplicates=True
-            ).execute()
-            
-            ranking_count += len(batch)
-            print(f"  Processed {ranking_count}/{len(players)} rankings...")
+            if player_batch or ranking_batch:
+                batches.append((player_batch, ranking_batch))
+        
+        changed_count = sum(len(player_batch) for player_batch, _ in batches)
+        ranking_count = sum(len(ranking_batch) for _, ranking_batch in batches)
+        print(f"  - Players to insert/update (new or changed): {changed_count}")
+        print(f"  - Rankings to insert (not yet seeded for {scraped_date}): {ranking_count}")
+        
+        if not batches:
+            print("\nNothing to insert, this date is already fully seeded")
+        elif os.getenv("SUPABASE_DB_URL"):
+            print("\nCopying players and rankings over direct Postgres connection...")
+            copy_players_and_rankings(
+                (row for player_batch, _ in batches for row in player_batch),
+                (row for _, ranking_batch in batches for row in ranking_batch)
+            )
+        else:
+            print("\nInserting/updating players and rankings...")
+            asyncio.run(upsert_players_and_rankings(batches))
+        
+        for player_batch, _ in batches:
+            existing_players.update((row['fide_id'], (row['name'], row['birth_year'])) for row in player_batch)
         
         print(f"\nSuccessfully seeded {len(players)} players for date {data_date}")
         
@@ -210,7 +491,10 @@ def seed_database(filepath, data_date, min_rating=2500):
         print("\nSummary:")
         print(f"  - Total players processed: {len(players)}")
         print(f"  - New players added: {len(new_players)}")
-        print(f"  - Existing players updated: {len(existing_players)}")
+        print(f"  - Existing players updated: {changed_count - len(new_players)}")
+        print(f"  - Existing players unchanged: {len(players) - changed_count}")
+        print(f"  - Rankings inserted: {ranking_count}")
+        print(f"  - Rankings already seeded: {len(players) - ranking_count}")
         
     except Exception as e:
         print(f"Error seeding database: {e}")
@@ -225,18 +509,24 @@ def seed_multiple_files(file_list, min_rating=2500):
     # Sort by date to ensure chronological order
     file_list_sorted = sorted(file_list, key=lambda x: x[1])
     
+    # Fetched once and kept up to date by seed_database, rather than re-queried for every file
+    existing_players = get_existing_players(get_db_connection())
+    
     for filepath, data_date in file_list_sorted:
         print(f"\n{'='*80}")
         print(f"Processing: {os.path.basename(filepath)}")
         print('='*80)
         
         try:
-            seed_database(filepath, data_date, min_rating)
+            seed_database(filepath, data_date, min_rating, existing_players)
         except Exception as e:
             print(f"Failed to seed {filepath}: {e}")
             response = input("Continue with next file? (y/n): ")
             if response.lower() != 'y':
                 break
+            
+            # A failed file may have inserted some of its players, so resync with the database
+            existing_players = get_existing_players(get_db_connection())
 
 # Main entry point, seeds all data from text files in historical_data directory
 def main():
@@ -1,6 +1,9 @@
+import io
 import os
 import zipfile
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 from seed_historical_data import seed_database
@@ -12,46 +15,51 @@ def get_current_month_code():
     year_code = current.strftime('%y')
     return f"{month_name}{year_code}"
 
-def download_monthly_data(month_code, output_dir="historical_data"):
+# Pooled HTTP session (keep-alive connections reused across requests) that retries transient failures with backoff
+def get_http_session():
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# Downloads and extracts the month's zip using the caller's session, which owns the pooled connections
+def download_monthly_data(month_code, session, output_dir="historical_data"):
     url = f"http://ratings.fide.com/download/standard_{month_code}frl.zip"
     
     os.makedirs(output_dir, exist_ok=True)
     
-    zip_filename = os.path.join(output_dir, f"standard_{month_code}frl.zip")
     txt_filename = os.path.join(output_dir, f"standard_{month_code}frl.txt")
     
     try:
         print(f"Downloading FIDE data for {month_code}...")
         print(f"URL: {url}")
         
-        response = requests.get(url, timeout=60)
-        
-        if response.status_code == 200:
-            # Save zip file
-            with open(zip_filename, 'wb') as f:
-                f.write(response.content)
-            print(f"Downloaded: {zip_filename}")
-            
-            # Extract zip file
-            print(f"Extracting zip file...")
-            with zipfile.ZipFile(zip_filename, 'r') as zip_ref:
-                zip_ref.extractall(output_dir)
-            print(f"Extracted to: {output_dir}")
-            
-            # Delete zip file
-            os.remove(zip_filename)
-            print(f"Deleted zip file")
-            
-            # Verify text file exists
-            if os.path.exists(txt_filename):
-                print(f"Text file ready: {txt_filename}")
-                return txt_filename
-            else:
-                print(f"Error: Text file not found after extraction")
+        # Closing the streamed response releases its connection back to the pool on every path
+        with session.get(url, stream=True, timeout=60) as response:
+            if response.status_code != 200:
+                print(f"Download failed (Status: {response.status_code})")
                 return None
-                
+            
+            # Keep the zip in memory (a few MB) so only the extracted text file touches the disk
+            zip_buffer = io.BytesIO()
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                zip_buffer.write(chunk)
+            print(f"Downloaded {zip_buffer.tell()} bytes")
+        
+        # Extract zip file
+        print(f"Extracting zip file...")
+        with zipfile.ZipFile(zip_buffer, 'r') as zip_ref:
+            zip_ref.extractall(output_dir)
+        print(f"Extracted to: {output_dir}")
+        
+        # Verify text file exists
+        if os.path.exists(txt_filename):
+            print(f"Text file ready: {txt_filename}")
+            return txt_filename
         else:
-            print(f"Download failed (Status: {response.status_code})")
+            print(f"Error: Text file not found after extraction")
             return None
             
     except Exception as e:
@@ -75,7 +83,8 @@ def main():
     print("STEP 1: DOWNLOADING DATA")
     print('='*80)
     
-    txt_file = download_monthly_data(month_code)
+    with get_http_session() as session:
+        txt_file = download_monthly_data(month_code, session)
     
     if not txt_file:
         print("\nFailed to download/extract monthly data")
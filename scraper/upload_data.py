@@ -1,8 +1,9 @@
 import os
-import json
+import orjson
 from datetime import datetime
 from dotenv import load_dotenv
 from supabase import create_client, Client
+from postgrest.types import ReturnMethod
 
 load_dotenv()
 
@@ -14,8 +15,8 @@ def get_db_connection():
 # Uploads the latest scraped ratings data to supabase
 def upload_rankings():
     
-    with open('data/rankings_latest.json', 'r') as f:
-        players = json.load(f)
+    with open('data/rankings_latest.json', 'rb') as f:
+        players = orjson.loads(f.read())
     
     if not players:
         print("No data to upload!")
@@ -41,7 +42,8 @@ def upload_rankings():
         
         conn.table("players").upsert(
             player_data,
-            on_conflict='fide_id'
+            on_conflict='fide_id',
+            returning=ReturnMethod.minimal  # Don't send the upserted rows back
         ).execute()
         
         print(f"Upserted {len(player_data)} players")
@@ -63,7 +65,8 @@ def upload_rankings():
         conn.table("rankings").upsert(
             ranking_data,
             on_conflict='fide_id,scraped_date',
-            ignore_duplicates=True
+            ignore_duplicates=True,
+            returning=ReturnMethod.minimal
         ).execute()
         
         print(f"Inserted {len(ranking_data)} rankings for {scraped_date}")